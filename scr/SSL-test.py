@@ -1,11 +1,13 @@
 import os
 import requests
-import pandas as pd
 import ssl
 import urllib3
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from search_index import index_records
+from csv_sink import sort_records, write_records_csv
+
 # Disable SSL warnings for debugging
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
@@ -86,19 +88,16 @@ def fetch_tweets():
             })
         
         # Save results
-        df = pd.DataFrame(rows)
-        if not df.empty:
-            df.sort_values(['retweets', 'likes'], ascending=False, inplace=True)
-            
-            # Ensure data directory exists
-            os.makedirs('data', exist_ok=True)
+        if rows:
+            rows = sort_records(rows, ['retweets', 'likes'])
             
-            df.to_csv('data/trending_ai_research_tweets.csv', index=False)
-            print(f'Saved {len(df)} tweets to data/trending_ai_research_tweets.csv')
+            write_records_csv(rows, 'data/trending_ai_research_tweets.csv')
+            index_records(rows, 'twitter')
+            print(f'Saved {len(rows)} tweets to data/trending_ai_research_tweets.csv')
             
             # Display top tweets
             print("\nTop tweets by engagement:")
-            for idx, row in df.head(3).iterrows():
+            for row in rows[:3]:
                 print(f"- {row['text'][:100]}... (Likes: {row['likes']}, RTs: {row['retweets']})")
         else:
             print('No tweets found.')
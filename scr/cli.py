@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Lightweight entry point: every stage imports its scraper only when it
+# runs, and each scraper defers bs4/twikit/scipy to the code that uses them.
+
+HEAVY_MODULES = ['pandas', 'numpy', 'scipy', 'bs4', 'twikit']
+
+# Import-time budget (ms) and modules each stage must not load at import;
+# twikit_scraper pays for asyncio, which its coroutines use directly
+IMPORT_BUDGETS = {
+    'cli': (50, HEAVY_MODULES + ['requests', 'asyncio']),
+    'search_index': (50, HEAVY_MODULES + ['requests', 'asyncio']),
+    'twikit_scraper': (150, HEAVY_MODULES + ['requests']),
+    'nitter_scraper': (250, HEAVY_MODULES),
+    'reddit_ai_scraper': (250, HEAVY_MODULES),
+    'SSL-test': (250, HEAVY_MODULES)
+}
+
+def run_reddit(args):
+    """Scrape AI research posts from Reddit"""
+    from reddit_ai_scraper import scrape_ai_research_reddit
+    scrape_ai_research_reddit(combined=not args.per_subreddit, max_pages=args.pages)
+
+def run_hackernews(args):
+    """Fetch AI research stories from Hacker News"""
+    from reddit_ai_scraper import fetch_hacker_news
+    fetch_hacker_news(days=args.days)
+
+def run_nitter(args):
+    """Scrape high-engagement tweets through Nitter"""
+    from nitter_scraper import main
+    main()
+
+def run_twikit(args):
+    """Scrape high-engagement tweets through twikit, or print setup help"""
+    from twikit_scraper import setup_credentials
+
+    if not all([os.getenv('TWITTER_USERNAME'), os.getenv('TWITTER_EMAIL'), os.getenv('TWITTER_PASSWORD')]):
+        setup_credentials()
+        return
+
+    import asyncio
+    from twikit_scraper import main
+    asyncio.run(main())
+
+def run_trending(args):
+    """Fetch trending tweets from the Twitter v2 API"""
+    # The module name has a hyphen, so it can't be imported with a plain import
+    import importlib
+    importlib.import_module('SSL-test').fetch_tweets()
+
+def run_setup(args):
+    """Print twikit credential setup instructions"""
+    from twikit_scraper import setup_credentials
+    setup_credentials()
+
+def run_search(args):
+    """Query the full-text search index"""
+    from search_index import run_search_command
+    run_search_command(args)
+
+def measure_import(module, forbidden):
+    """Import a module in a fresh interpreter and report time and heavy modules
+
+    Returns (elapsed_ms, heavy_modules_loaded, missing_dependency).
+    """
+    code = (
+        "import importlib, json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "try:\n"
+        f"    importlib.import_module({module!r})\n"
+        "    missing = None\n"
+        "except ModuleNotFoundError as e:\n"
+        "    missing = e.name\n"
+        "elapsed = (time.perf_counter() - start) * 1000\n"
+        f"heavy = [m for m in {forbidden!r} if m in sys.modules]\n"
+        "print(json.dumps([elapsed, heavy, missing]))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    ).stdout
+
+    return json.loads(output)
+
+def run_import_budget(args):
+    """Check that each stage module imports within budget and without heavy dependencies
+
+    A module that can't be imported (missing dependency) also fails the
+    check, since its budget was never measured.
+    """
+    failed = False
+
+    for module, (budget, forbidden) in IMPORT_BUDGETS.items():
+        elapsed, heavy, missing = measure_import(module, forbidden)
+
+        if missing:
+            print(f"import {module}: not measured ({missing} not installed)")
+            failed = True
+            continue
+
+        print(f"import {module}: {elapsed:.1f} ms (budget {budget} ms)")
+        if heavy:
+            print(f"  Heavy modules loaded at import: {', '.join(heavy)}")
+
+        if elapsed > budget or heavy:
+            failed = True
+
+    if failed:
+        sys.exit(1)
+
+def main(argv=None):
+    """Dispatch to a single scraping or search stage"""
+    parser = argparse.ArgumentParser(description='AI research data collection')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    reddit_parser = subparsers.add_parser('reddit', help='Scrape Reddit')
+    reddit_parser.add_argument('--pages', type=int, default=5, help='Page budget for the combined listing')
+    reddit_parser.add_argument('--per-subreddit', action='store_true', help='One request per subreddit instead')
+    reddit_parser.set_defaults(func=run_reddit)
+    hn_parser = subparsers.add_parser('hn', help='Fetch Hacker News')
+    hn_parser.add_argument('--days', type=int, default=30, help='Date range to harvest')
+    hn_parser.set_defaults(func=run_hackernews)
+    subparsers.add_parser('nitter', help='Scrape tweets via Nitter').set_defaults(func=run_nitter)
+    subparsers.add_parser('twikit', help='Scrape tweets via twikit').set_defaults(func=run_twikit)
+    subparsers.add_parser('trending', help='Fetch tweets via the Twitter v2 API').set_defaults(func=run_trending)
+    subparsers.add_parser('setup', help='Show twikit credential setup').set_defaults(func=run_setup)
+
+    from search_index import add_search_arguments, merge_query_terms
+    search_parser = subparsers.add_parser('search', help='Query the search index')
+    add_search_arguments(search_parser)
+    search_parser.set_defaults(func=run_search)
+
+    subparsers.add_parser('import-budget', help='Check stage import times').set_defaults(func=run_import_budget)
+
+    args, extra = parser.parse_known_args(argv)
+    if args.command == 'search':
+        merge_query_terms(args, extra, search_parser)
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+
+    try:
+        args.func(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import csv
+import os
+
+# Lightweight record helpers so scrapers can write results without pandas
+
+def sort_records(records, keys, descending=True):
+    """Sort a list of record dicts by one or more numeric keys"""
+    return sorted(records, key=lambda record: tuple(record.get(key) or 0 for key in keys),
+                  reverse=descending)
+
+def drop_duplicate_records(records, key):
+    """Keep the first record for each value of `key` (records without one are all kept)"""
+    seen = set()
+    unique = []
+
+    for record in records:
+        value = record.get(key)
+        if value in (None, ''):
+            unique.append(record)
+            continue
+        if value in seen:
+            continue
+        seen.add(value)
+        unique.append(record)
+
+    return unique
+
+def write_records_csv(records, output_file):
+    """Write record dicts to CSV, with columns in order of first appearance"""
+    fieldnames = []
+    for record in records:
+        for field in record:
+            if field not in fieldnames:
+                fieldnames.append(field)
+
+    directory = os.path.dirname(output_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+
+    return len(records)
+
+def read_records_csv(input_file):
+    """Read record dicts back from a CSV written by write_records_csv"""
+    if not os.path.exists(input_file):
+        return []
+
+    with open(input_file, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
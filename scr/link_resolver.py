@@ -0,0 +1,241 @@
+import json
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Persistent cache of short link -> expanded link, shared by all scrapers
+LINK_CACHE_FILE = 'data/link_cache.json'
+
+# Hosts that only redirect somewhere else and need a network round-trip
+SHORTENER_HOSTS = {
+    't.co', 'bit.ly', 'buff.ly', 'ow.ly', 'tinyurl.com', 'lnkd.in',
+    'goo.gl', 'dlvr.it', 'trib.al', 'shorturl.at', 'rb.gy', 'is.gd'
+}
+
+# Host prefixes that point at the same site as the bare host
+HOST_PREFIXES = ('www.', 'm.', 'mobile.')
+
+# Site-specific subdomains that are aliases of the bare host
+SITE_HOST_PREFIXES = {
+    'reddit.com': ('old.', 'new.', 'np.')
+}
+
+# Host aliases collapsed onto a single canonical host
+HOST_ALIASES = {
+    'twitter.com': 'x.com',
+    'youtu.be': 'youtube.com',
+    'export.arxiv.org': 'arxiv.org'
+}
+
+# Tracking query parameters that never change the target page (plus utm_*)
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'mc_cid', 'mc_eid', 'igshid', 'cmpid'
+}
+
+# Share/tracking parameters that are only safe to drop on specific hosts
+HOST_TRACKING_PARAMS = {
+    'x.com': {'s', 't', 'ref_src', 'ref_url'},
+    'youtube.com': {'si', 'feature'}
+}
+
+ARXIV_ID_PATTERN = re.compile(r'^/(?:abs|pdf|html)/([a-z\-]+(?:\.[A-Z]{2})?/\d{7}|\d{4}\.\d{4,5})(?:v\d+)?(?:\.pdf)?/?$')
+
+URL_PATTERN = re.compile(r'https?://[^\s<>"\')\]]+')
+
+def extract_links(text):
+    """Extract http(s) links from free text such as tweet bodies"""
+    if not text:
+        return []
+    return [link.rstrip('.,;:!?…') for link in URL_PATTERN.findall(text)]
+
+def normalize_host(host):
+    """Lowercase a host and collapse mobile/www variants and aliases"""
+    host = host.lower().rstrip('.')
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix) and host.count('.') > 1:
+            host = host[len(prefix):]
+            break
+    for site, prefixes in SITE_HOST_PREFIXES.items():
+        for prefix in prefixes:
+            if host == prefix + site:
+                host = site
+    return HOST_ALIASES.get(host, host)
+
+def canonicalize_url(url):
+    """Canonicalize a URL so different variants of one page compare equal"""
+    if not url:
+        return ''
+
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        return url.strip()
+
+    host = normalize_host(parts.hostname)
+    path = parts.path or '/'
+
+    # Keep credentials and non-default ports; they select a different service
+    try:
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    netloc = host
+    if port and port != {'http': 80, 'https': 443}[parts.scheme]:
+        netloc = f"{netloc}:{port}"
+    if parts.username:
+        userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+        netloc = f"{userinfo}@{netloc}"
+
+    # arXiv abs/pdf/html links and versions all map to the abstract page
+    if host == 'arxiv.org':
+        match = ARXIV_ID_PATTERN.match(path)
+        if match:
+            return f"https://arxiv.org/abs/{match.group(1)}"
+
+    # youtu.be/<id> and youtube.com/watch?v=<id> are the same video
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if host == 'youtube.com' and parts.hostname.lower().endswith('youtu.be'):
+        query = [('v', path.strip('/'))] + query
+        path = '/watch'
+
+    # Drop tracking parameters and sort the rest for a stable key
+    host_params = HOST_TRACKING_PARAMS.get(host, set())
+    query = sorted(
+        (key, value) for key, value in query
+        if not key.lower().startswith('utm_')
+        and key.lower() not in TRACKING_PARAMS
+        and key.lower() not in host_params
+    )
+
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    return urlunsplit(('https', netloc, path, urlencode(query), ''))
+
+def needs_expansion(url):
+    """Check whether a link is a known shortener that must be followed"""
+    try:
+        host = (urlsplit(url).hostname or '').lower()
+    except ValueError:
+        return False
+    return host in SHORTENER_HOSTS
+
+def create_link_session(max_workers=8):
+    """Create a requests session with a connection pool sized for the workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers['User-Agent'] = 'AI Research Scraper 1.0'
+    return session
+
+def expand_url(url, session, timeout=10):
+    """Follow redirects for a short link, returning the final URL or None
+
+    None means the link could not be expanded (error status, rate limit, or
+    still on a shortener) and should be retried on a later run.
+    """
+    try:
+        response = session.head(url, allow_redirects=True, timeout=timeout)
+
+        # Some hosts reject HEAD; fall back to a streamed GET without the body
+        if response.status_code in (403, 405, 501):
+            response = session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+            response.close()
+
+        if response.status_code >= 400:
+            print(f"Error resolving {url}: HTTP {response.status_code}")
+            return None
+        if needs_expansion(response.url):
+            print(f"Error resolving {url}: still on a short link ({response.url})")
+            return None
+
+        return response.url
+
+    except Exception as e:
+        print(f"Error resolving {url}: {e}")
+        return None
+
+def load_link_cache(cache_path=LINK_CACHE_FILE):
+    """Load the persistent link resolution cache"""
+    if not os.path.exists(cache_path):
+        return {}
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Error loading link cache: {e}")
+        return {}
+
+def save_link_cache(entries, cache_path=LINK_CACHE_FILE):
+    """Merge new entries into the link cache, writing it atomically
+
+    Entries saved meanwhile by another scraper are kept. A failed save is
+    reported but not fatal: the links are simply resolved again next run.
+    """
+    tmp_path = None
+    try:
+        directory = os.path.dirname(cache_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+
+        cache = load_link_cache(cache_path)
+        cache.update(entries)
+
+        # A unique temp file per writer, so concurrent scrapers can't collide
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                         suffix='.tmp', delete=False) as f:
+            tmp_path = f.name
+            json.dump(cache, f, indent=0, sort_keys=True)
+        os.replace(tmp_path, cache_path)
+
+    except Exception as e:
+        print(f"Error saving link cache: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def resolve_links(urls, cache_path=LINK_CACHE_FILE, max_workers=8):
+    """Resolve and canonicalize links, following each distinct short link only once
+
+    Returns a dict mapping every input link to its canonical form. Short
+    links are expanded concurrently with HEAD requests; only the expanded
+    URLs are kept in the persistent cache, so later sources and runs skip
+    the network while canonicalization rules always apply at lookup time.
+    """
+    urls = [url for url in urls if url]
+    short_links = sorted({url for url in urls if needs_expansion(url)})
+
+    expanded = {}
+    if short_links:
+        cache = load_link_cache(cache_path)
+        to_expand = [url for url in short_links if url not in cache]
+
+        if to_expand:
+            print(f"Resolving {len(to_expand)} short links ({max_workers} workers)")
+            session = create_link_session(max_workers)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(lambda url: expand_url(url, session), to_expand)
+
+                new_entries = {}
+                for url, final_url in zip(to_expand, results):
+                    # Failed lookups are not cached so the next run retries them
+                    if final_url:
+                        new_entries[url] = final_url
+
+            session.close()
+            cache.update(new_entries)
+            if new_entries:
+                save_link_cache(new_entries, cache_path)
+
+        expanded = {url: cache[url] for url in short_links if url in cache}
+
+    return {url: canonicalize_url(expanded.get(url, url)) for url in urls}
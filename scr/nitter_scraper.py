@@ -1,13 +1,20 @@
 import requests
 import re
-import pandas as pd
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from html import unescape
 from urllib.parse import quote
 import time
-import os
 
 # Import your existing query config
 from twitter_query import MIN_RETWEETS, MIN_LIKES
+from search_index import index_records
+from csv_sink import sort_records, drop_duplicate_records, read_records_csv, write_records_csv
+
+# "Load more" link carrying Nitter's opaque pagination cursor
+SHOW_MORE_PATTERN = re.compile(r'<div class="show-more">\s*<a href="([^"]*cursor=[^"]*)"')
+
+# Tweet permalink, e.g. /user/status/1234567890#m
+STATUS_ID_PATTERN = re.compile(r'/status/(\d+)')
 
 def convert_query_to_nitter(twitter_query):
     """Convert Twitter API query to Nitter search format"""
@@ -41,8 +48,26 @@ def parse_engagement_numbers(text):
     else:
         return 0
 
-def scrape_nitter_search(query, max_pages=3):
-    """Scrape Nitter search results"""
+def extract_next_cursor_url(instance, html):
+    """Return the absolute URL of the "load more" page, or None on the last page"""
+    links = SHOW_MORE_PATTERN.findall(html)
+    if not links:
+        return None
+    
+    # The top "load newest" link has no cursor; the last show-more is "load more"
+    href = unescape(links[-1])
+    if href.startswith('?'):
+        return f"{instance}/search{href}"
+    return f"{instance}{href}" if href.startswith('/') else href
+
+def scrape_nitter_search(query, max_pages=3, seen_ids=None, min_interval=2):
+    """Scrape Nitter search results, following the real "load more" cursor
+    
+    The next page is prefetched while the current one is parsed. Crawling
+    stops at the first page containing a tweet already in `seen_ids` (or
+    already collected in this run), so deep crawls skip redundant pages.
+    """
+    from bs4 import BeautifulSoup
     
     nitter_instances = [
         'https://nitter.net',
@@ -50,47 +75,84 @@ def scrape_nitter_search(query, max_pages=3):
         'https://nitter.pussthecat.org'
     ]
     
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
     encoded_query = quote(query)
+    seen_ids = set(seen_ids or [])
     tweets = []
+    last_request = [0.0]
+    
+    def fetch_page(url):
+        # Rate limiting: space request starts instead of sleeping after parsing
+        wait = min_interval - (time.monotonic() - last_request[0])
+        if wait > 0:
+            time.sleep(wait)
+        last_request[0] = time.monotonic()
+        return requests.get(url, headers=headers, timeout=10)
     
     for instance in nitter_instances:
+        # Set once the instance serves a timeline, even if nothing on it is new
+        answered = False
         try:
             print(f"Trying {instance}...")
             
-            for page in range(1, max_pages + 1):
+            executor = ThreadPoolExecutor(max_workers=1)
+            try:
                 url = f"{instance}/search?q={encoded_query}&f=tweets"
-                if page > 1:
-                    url += f"&cursor={page}"
-                
-                print(f"Fetching page {page}: {url}")
-                
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                
-                response = requests.get(url, headers=headers, timeout=10)
-                
-                if response.status_code != 200:
-                    print(f"Failed to fetch page {page}: {response.status_code}")
-                    continue
+                print(f"Fetching page 1: {url}")
+                pending = executor.submit(fetch_page, url)
                 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                tweet_containers = soup.find_all('div', class_='timeline-item')
-                
-                if not tweet_containers:
-                    print(f"No tweets found on page {page}")
-                    break
-                
-                page_tweets = parse_tweets_from_html(tweet_containers)
-                tweets.extend(page_tweets)
-                
-                print(f"Found {len(page_tweets)} tweets on page {page}")
-                
-                # Rate limiting
-                time.sleep(2)
+                for page in range(1, max_pages + 1):
+                    response = pending.result()
+                    pending = None
+                    
+                    if response.status_code != 200:
+                        print(f"Failed to fetch page {page}: {response.status_code}")
+                        break
+                    
+                    html = response.text
+                    next_url = extract_next_cursor_url(instance, html) if page < max_pages else None
+                    
+                    # Start fetching the next page before parsing this one, unless a
+                    # cheap scan already shows known tweets (the crawl will stop here)
+                    if next_url and not seen_ids.intersection(STATUS_ID_PATTERN.findall(html)):
+                        print(f"Prefetching page {page + 1}: {next_url}")
+                        pending = executor.submit(fetch_page, next_url)
+                    
+                    soup = BeautifulSoup(html, 'html.parser')
+                    tweet_containers = soup.find_all('div', class_='timeline-item')
+                    
+                    if not tweet_containers:
+                        print(f"No tweets found on page {page}")
+                        break
+                    answered = True
+                    
+                    page_tweets = parse_tweets_from_html(tweet_containers)
+                    new_tweets = [tweet for tweet in page_tweets if not tweet['id'] or tweet['id'] not in seen_ids]
+                    seen_ids.update(tweet['id'] for tweet in page_tweets if tweet['id'])
+                    tweets.extend(new_tweets)
+                    
+                    print(f"Found {len(new_tweets)} new tweets on page {page}")
+                    
+                    if len(new_tweets) < len(page_tweets):
+                        print(f"Reached already-seen tweets on page {page}, stopping")
+                        break
+                    
+                    # The scan matched only a linked/quoted tweet; fetch the next page now
+                    if next_url and not pending:
+                        print(f"Fetching page {page + 1}: {next_url}")
+                        pending = executor.submit(fetch_page, next_url)
+                    if not pending:
+                        break
+            finally:
+                # Don't block on a prefetch nobody will use
+                executor.shutdown(wait=False, cancel_futures=True)
             
-            if tweets:
-                print(f"Successfully scraped {len(tweets)} tweets from {instance}")
+            # Only fall back to another mirror when this one actually failed
+            if answered:
+                print(f"Successfully scraped {len(tweets)} new tweets from {instance}")
                 break
                 
         except Exception as e:
@@ -112,6 +174,10 @@ def parse_tweets_from_html(tweet_containers):
             
             text = tweet_content.get_text(strip=True)
             
+            # Outbound links; relative hrefs are Nitter's own profile/hashtag pages
+            links = [a.get('href', '') for a in tweet_content.find_all('a')]
+            links = [link for link in links if link.startswith(('http://', 'https://'))]
+            
             # Extract engagement metrics
             stats = container.find('div', class_='tweet-stats')
             if not stats:
@@ -140,17 +206,24 @@ def parse_tweets_from_html(tweet_containers):
             timestamp_elem = container.find('a', class_='tweet-date')
             timestamp = timestamp_elem.get('title', '') if timestamp_elem else ''
             
+            # Extract tweet ID from the permalink
+            link_elem = container.find('a', class_='tweet-link') or timestamp_elem
+            match = STATUS_ID_PATTERN.search(link_elem.get('href', '')) if link_elem else None
+            tweet_id = match.group(1) if match else ''
+            
             # Extract username
             username_elem = container.find('a', class_='username')
             username = username_elem.get_text(strip=True) if username_elem else ''
             
             tweets.append({
+                'id': tweet_id,
                 'text': text,
                 'username': username,
                 'timestamp': timestamp,
                 'retweets': retweets,
                 'likes': likes,
-                'replies': replies
+                'replies': replies,
+                'links': ' '.join(links)
             })
             
         except Exception as e:
@@ -186,32 +259,52 @@ def main():
     nitter_query = convert_query_to_nitter(TWITTER_QUERY)
     print(f"Nitter query: {nitter_query}")
     
+    # Tweets saved by earlier runs; the crawl stops once it reaches them
+    output_file = 'data/nitter_high_engagement_tweets.csv'
+    previous_tweets = read_records_csv(output_file)
+    for tweet in previous_tweets:
+        for field in ('retweets', 'likes', 'replies'):
+            tweet[field] = int(tweet.get(field) or 0)
+    seen_ids = {tweet['id'] for tweet in previous_tweets if tweet.get('id')}
+    
     # Scrape tweets
-    tweets = scrape_nitter_search(nitter_query, max_pages=2)
+    tweets = scrape_nitter_search(nitter_query, max_pages=2, seen_ids=seen_ids)
     
     if not tweets:
-        print("No tweets found. Try a simpler query.")
+        print("No new tweets found. Try a simpler query.")
         return
     
     # Filter by engagement
     high_engagement_tweets = filter_high_engagement_tweets(tweets)
     
     if high_engagement_tweets:
-        # Save to CSV
-        df = pd.DataFrame(high_engagement_tweets)
-        df = df.sort_values(['retweets', 'likes'], ascending=False)
+        # Canonicalize outbound links, sharing the resolution cache with other sources
+        from link_resolver import resolve_links
+        tweet_links = [tweet['links'].split() for tweet in high_engagement_tweets]
+        resolved = resolve_links([link for links in tweet_links for link in links])
+        for tweet, links in zip(high_engagement_tweets, tweet_links):
+            tweet['links'] = ' '.join(resolved[link] for link in links)
+        
+        index_records(high_engagement_tweets, 'nitter')
+        
+        # Save to CSV, keeping tweets from earlier runs
+        tweets = drop_duplicate_records(high_engagement_tweets + previous_tweets, 'id')
+        tweets = sort_records(tweets, ['retweets', 'likes'])
         
-        output_file = 'data/nitter_high_engagement_tweets.csv'
-        os.makedirs('data', exist_ok=True)
-        df.to_csv(output_file, index=False)
+        try:
+            from topic_tagger import tag_topics
+            tag_topics(tweets)
+        except Exception as e:
+            print(f"Skipping topic tagging ({e}); saving untagged results")
+        write_records_csv(tweets, output_file)
         
-        print(f"\nSaved {len(df)} high-engagement tweets to {output_file}")
+        print(f"\nSaved {len(high_engagement_tweets)} new high-engagement tweets to {output_file} ({len(tweets)} total)")
         
         # Display top results
         print(f"\nTop tweets:")
-        for idx, row in df.head(5).iterrows():
-            print(f"- @{row['username']} | RT:{row['retweets']} L:{row['likes']}")
-            print(f"  {row['text'][:100]}...")
+        for tweet in tweets[:5]:
+            print(f"- @{tweet['username']} | RT:{tweet['retweets']} L:{tweet['likes']}")
+            print(f"  {tweet['text'][:100]}...")
             print()
     else:
         print("No tweets meet engagement criteria.")
@@ -1,9 +1,22 @@
 import requests
 import json
-import pandas as pd
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from twitter_query import MIN_RETWEETS, MIN_LIKES
+from search_index import index_records
+from csv_sink import sort_records, drop_duplicate_records, write_records_csv
+
+# Length of each Reddit time filter, used to stop paginating past the window
+TIME_FILTER_SECONDS = {
+    'hour': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+    'month': 31 * 86400,
+    'year': 366 * 86400,
+    'all': None
+}
 
 def fetch_reddit_posts(subreddit, search_terms, limit=25):
     """Fetch Reddit posts about AI research"""
@@ -41,6 +54,78 @@ def fetch_reddit_posts(subreddit, search_terms, limit=25):
         print(f"Error fetching from r/{subreddit}: {e}")
         return []
 
+def fetch_multireddit_posts(subreddits, search_terms, max_pages=5, sort='hot', time_filter='week'):
+    """Fetch posts for several subreddits through one combined r/A+B+C listing
+
+    Follows the `after` cursor at limit=100 until `max_pages` is spent, the
+    listing ends, or (with sort='new') posts fall outside `time_filter`.
+    Returns a dict mapping each requested subreddit to its posts.
+    """
+    
+    # Reddit JSON API endpoint for the combined multireddit
+    url = f"https://www.reddit.com/r/{'+'.join(subreddits)}/search.json"
+    
+    # Search query
+    query = " OR ".join(search_terms)
+    
+    params = {
+        'q': query,
+        'restrict_sr': 'on',  # Search within the listed subreddits
+        'sort': sort,         # Sort by hot posts by default
+        'limit': 100,         # Maximum page size
+        't': time_filter
+    }
+    
+    headers = {
+        'User-Agent': 'AI Research Scraper 1.0'
+    }
+    
+    window = TIME_FILTER_SECONDS.get(time_filter)
+    cutoff = time.time() - window if window else None
+    
+    # Reddit reports canonical capitalization; map back to the requested names
+    names = {subreddit.lower(): subreddit for subreddit in subreddits}
+    posts_by_subreddit = {subreddit: [] for subreddit in subreddits}
+    
+    print(f"Fetching from r/{'+'.join(subreddits)} with query: {query}")
+    
+    for page in range(1, max_pages + 1):
+        try:
+            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response.raise_for_status()
+            
+            data = response.json().get('data', {})
+            posts = data.get('children', [])
+            
+        except Exception as e:
+            print(f"Error fetching page {page} of combined listing: {e}")
+            break
+        
+        for post in posts:
+            subreddit = post.get('data', {}).get('subreddit', '')
+            posts_by_subreddit.setdefault(names.get(subreddit.lower(), subreddit), []).append(post)
+        
+        print(f"Found {len(posts)} posts on page {page}")
+        
+        after = data.get('after')
+        if not after or not posts:
+            break
+        
+        # Newest-first listings can stop once the page reaches past the window
+        oldest = min(post.get('data', {}).get('created_utc', 0) for post in posts)
+        if sort == 'new' and cutoff and oldest < cutoff:
+            break
+        
+        params['after'] = after
+        
+        # Rate limiting
+        time.sleep(1)
+    
+    for subreddit, posts in posts_by_subreddit.items():
+        print(f"Found {len(posts)} posts in r/{subreddit}")
+    
+    return posts_by_subreddit
+
 def parse_reddit_posts(posts, min_score=100):
     """Parse Reddit posts and filter by engagement"""
     
@@ -84,8 +169,12 @@ def parse_reddit_posts(posts, min_score=100):
     
     return parsed_posts
 
-def scrape_ai_research_reddit():
-    """Main function to scrape AI research from multiple subreddits"""
+def scrape_ai_research_reddit(combined=True, max_pages=5):
+    """Main function to scrape AI research from multiple subreddits
+
+    With `combined`, all subreddits share one paginated multireddit listing
+    instead of one capped request per subreddit.
+    """
     
     # Target subreddits for AI research
     subreddits = [
@@ -111,66 +200,182 @@ def scrape_ai_research_reddit():
     
     all_posts = []
     
-    for subreddit in subreddits:
-        posts = fetch_reddit_posts(subreddit, search_terms, limit=25)
-        if posts:
+    if combined:
+        posts_by_subreddit = fetch_multireddit_posts(subreddits, search_terms, max_pages=max_pages)
+        for posts in posts_by_subreddit.values():
             parsed = parse_reddit_posts(posts, min_score=50)  # Lower threshold for Reddit
             all_posts.extend(parsed)
-            
-        # Rate limiting
-        time.sleep(1)
+    else:
+        for subreddit in subreddits:
+            posts = fetch_reddit_posts(subreddit, search_terms, limit=25)
+            if posts:
+                parsed = parse_reddit_posts(posts, min_score=50)  # Lower threshold for Reddit
+                all_posts.extend(parsed)
+                
+            # Rate limiting
+            time.sleep(1)
     
     if not all_posts:
         print("No posts found meeting criteria")
         return
     
-    # Create DataFrame and sort by engagement
-    df = pd.DataFrame(all_posts)
-    df = df.sort_values(['score', 'comments'], ascending=False)
+    # Sort by engagement
+    posts = sort_records(all_posts, ['score', 'comments'])
     
     # Remove duplicates based on title similarity
-    df = df.drop_duplicates(subset=['title'], keep='first')
+    posts = drop_duplicate_records(posts, 'title')
+    
+    # Canonicalize outbound links so posts about the same page can be grouped
+    from link_resolver import resolve_links
+    resolved = resolve_links([post['url'] for post in posts])
+    for post in posts:
+        post['canonical_url'] = resolved.get(post['url'], '')
     
-    print(f"\nFound {len(df)} high-engagement posts")
+    # Tag every post with the ALT_QUERIES categories in one batch; tagging is
+    # optional (it needs scipy) and must never cost us the scraped posts
+    try:
+        from topic_tagger import tag_topics
+        tag_topics(posts)
+    except Exception as e:
+        print(f"Skipping topic tagging ({e}); saving untagged results")
+    
+    print(f"\nFound {len(posts)} high-engagement posts")
     
     # Save results
-    import os
-    os.makedirs('data', exist_ok=True)
-    df.to_csv('data/reddit_ai_research.csv', index=False)
+    write_records_csv(posts, 'data/reddit_ai_research.csv')
+    index_records(posts, 'reddit')
     
     print(f"Saved to data/reddit_ai_research.csv")
     
     # Display top results
     print(f"\nTop AI research discussions:")
-    for idx, row in df.head(10).iterrows():
-        print(f"\n- r/{row['subreddit']} | Score: {row['score']} | Comments: {row['comments']}")
-        print(f"  {row['title']}")
-        print(f"  {row['permalink']}")
+    for post in posts[:10]:
+        print(f"\n- r/{post['subreddit']} | Score: {post['score']} | Comments: {post['comments']}")
+        print(f"  {post['title']}")
+        print(f"  {post['permalink']}")
 
-def fetch_hacker_news():
-    """Alternative: Fetch from Hacker News"""
+def fetch_hn_window(session, params, start, end, retries=3, backoff=1):
+    """Fetch one created_at_i window from HN Algolia, returning (hits, total)
     
-    print("\n=== Fetching from Hacker News ===")
+    Timeouts, connection errors, rate limits (429) and server errors (5xx)
+    are retried with exponential backoff. Anything else (other 4xx, a bad
+    response body) fails immediately. Returns None if the window can't be
+    fetched.
+    """
     
     # HN Algolia API
     url = "https://hn.algolia.com/api/v1/search"
     
+    window_params = dict(params)
+    window_params['numericFilters'] = f"{params['numericFilters']},created_at_i>={start},created_at_i<{end}"
+    
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, params=window_params, timeout=10)
+            response.raise_for_status()
+            
+            data = response.json()
+            return data.get('hits', []), data.get('nbHits', 0)
+            
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            print(f"Error fetching HN window {start}-{end} (attempt {attempt + 1}/{retries + 1}): {e}")
+            
+        except requests.exceptions.HTTPError as e:
+            print(f"Error fetching HN window {start}-{end} (attempt {attempt + 1}/{retries + 1}): {e}")
+            status = e.response.status_code if e.response is not None else None
+            if status != 429 and not (status and status >= 500):
+                return None
+            
+        except Exception as e:
+            print(f"Error fetching HN window {start}-{end}: {e}")
+            return None
+        
+        if attempt < retries:
+            time.sleep(backoff * 2 ** attempt)
+    
+    return None
+
+def harvest_hacker_news(start, end, params, window_seconds=7 * 86400, max_workers=8):
+    """Harvest every HN hit between two epochs by sharding on created_at_i
+    
+    Windows are fetched concurrently over one pooled session. A window whose
+    total exceeds what a single page returns is split in half and refetched,
+    so no matching story is dropped. Hits are merged oldest window first.
+    
+    Returns (hits, missing) where `missing` lists the (start, end) windows
+    that failed even after retries; the hits are complete only if it is empty.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    
+    windows = [(t, min(t + window_seconds, end)) for t in range(start, end, window_seconds)]
+    results = {}
+    missing = []
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_hn_window, session, params, *window): window for window in windows}
+        
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                window_start, window_end = futures.pop(future)
+                result = future.result()
+                
+                if result is None:
+                    missing.append((window_start, window_end))
+                    continue
+                
+                hits, total = result
+                
+                # Window hit the page cap: narrow it and fetch both halves
+                if total > len(hits) and window_end - window_start > 1:
+                    middle = (window_start + window_end) // 2
+                    for window in ((window_start, middle), (middle, window_end)):
+                        futures[executor.submit(fetch_hn_window, session, params, *window)] = window
+                else:
+                    results[(window_start, window_end)] = hits
+    
+    session.close()
+    
+    # Merge in window order, dropping any story returned twice
+    merged = []
+    seen = set()
+    for window in sorted(results):
+        for hit in sorted(results[window], key=lambda hit: hit.get('created_at_i', 0)):
+            if hit.get('objectID') not in seen:
+                seen.add(hit.get('objectID'))
+                merged.append(hit)
+    
+    print(f"Fetched {len(results)} HN windows")
+    return merged, sorted(missing)
+
+def fetch_hacker_news(days=30):
+    """Alternative: Fetch from Hacker News"""
+    
+    print("\n=== Fetching from Hacker News ===")
+    
     params = {
         'query': 'AI research OR LLM OR "machine learning"',
         'tags': 'story',
-        'hitsPerPage': 50,
+        'hitsPerPage': 1000,  # Algolia's per-query cap
         'numericFilters': 'points>50,num_comments>10'  # High engagement filter
     }
     
+    end = int(time.time())
+    start = end - days * 86400
+    
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        hits = data.get('hits', [])
+        hits, missing = harvest_hacker_news(start, end, params)
         
         print(f"Found {len(hits)} HN stories")
         
+        if missing:
+            print(f"WARNING: results are incomplete, {len(missing)} HN windows failed:")
+            for window_start, window_end in missing:
+                print(f"  {datetime.fromtimestamp(window_start)} to {datetime.fromtimestamp(window_end)}")
+        
         hn_posts = []
         for hit in hits:
             hn_posts.append({
@@ -186,13 +391,24 @@ def fetch_hacker_news():
             })
         
         if hn_posts:
-            df_hn = pd.DataFrame(hn_posts)
-            df_hn.to_csv('data/hackernews_ai_research.csv', index=False)
+            from link_resolver import resolve_links
+            resolved = resolve_links([post['url'] for post in hn_posts])
+            for post in hn_posts:
+                post['canonical_url'] = resolved.get(post['url'], '')
+            
+            try:
+                from topic_tagger import tag_topics
+                tag_topics(hn_posts)
+            except Exception as e:
+                print(f"Skipping topic tagging ({e}); saving untagged results")
+            
+            write_records_csv(hn_posts, 'data/hackernews_ai_research.csv')
+            index_records(hn_posts, 'hackernews')
             print("Saved HN results to data/hackernews_ai_research.csv")
             
             print(f"\nTop HN AI stories:")
-            for idx, row in df_hn.head(5).iterrows():
-                print(f"- {row['score']} pts | {row['title']}")
+            for post in sort_records(hn_posts, ['score'])[:5]:
+                print(f"- {post['score']} pts | {post['title']}")
         
     except Exception as e:
         print(f"Error fetching HN: {e}")
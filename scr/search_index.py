@@ -0,0 +1,349 @@
+import argparse
+import csv
+import glob
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+# SQLite database holding every collected item plus its FTS5 index
+SEARCH_DB_FILE = 'data/search_index.db'
+
+# Map CSV file name prefixes under data/ to source labels for backfills
+CSV_SOURCES = {
+    'reddit': 'reddit',
+    'hackernews': 'hackernews',
+    'nitter': 'nitter',
+    'twikit': 'twitter',
+    'trending': 'twitter'
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    item_key TEXT NOT NULL UNIQUE,
+    source TEXT NOT NULL,
+    title TEXT,
+    text TEXT,
+    author TEXT,
+    url TEXT,
+    created TEXT,
+    created_ts INTEGER,
+    engagement INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS items_source_created ON items(source, created_ts);
+CREATE INDEX IF NOT EXISTS items_created ON items(created_ts);
+CREATE INDEX IF NOT EXISTS items_engagement ON items(engagement);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(
+    title, text, content='items', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS items_ai AFTER INSERT ON items BEGIN
+    INSERT INTO items_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS items_ad AFTER DELETE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS items_au AFTER UPDATE ON items BEGIN
+    INSERT INTO items_fts(items_fts, rowid, title, text) VALUES ('delete', old.id, old.title, old.text);
+    INSERT INTO items_fts(rowid, title, text) VALUES (new.id, new.title, new.text);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO items (item_key, source, title, text, author, url, created, created_ts, engagement, comments)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(item_key) DO UPDATE SET
+    title = excluded.title,
+    text = excluded.text,
+    author = excluded.author,
+    url = excluded.url,
+    created = excluded.created,
+    created_ts = excluded.created_ts,
+    engagement = excluded.engagement,
+    comments = excluded.comments
+WHERE engagement != excluded.engagement OR comments != excluded.comments OR text IS NOT excluded.text
+"""
+
+# Timestamp formats produced by the different scrapers
+DATE_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',           # Reddit
+    '%Y-%m-%dT%H:%M:%S.%fZ',       # Twitter API
+    '%Y-%m-%dT%H:%M:%SZ',          # Hacker News
+    '%a %b %d %H:%M:%S %z %Y',     # twikit
+    '%b %d, %Y · %I:%M %p %Z',     # Nitter
+    '%Y-%m-%d'
+]
+
+QUERY_TOKEN_PATTERN = re.compile(r'-?"[^"]*"|[()]|[^\s()]+')
+
+# Twitter operators such as lang:en, -is:retweet, from:user
+TWITTER_OPERATOR_PATTERN = re.compile(r'^-?[A-Za-z_]+:\S+$')
+
+def connect_index(db_path=SEARCH_DB_FILE):
+    """Open the search index, creating the schema if needed"""
+    directory = os.path.dirname(db_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.executescript(SCHEMA)
+    return conn
+
+def parse_created(value):
+    """Parse a scraper timestamp into a UTC epoch, or None if unknown"""
+    if value is None or value == '':
+        return None
+
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        return int(value.replace(tzinfo=value.tzinfo or timezone.utc).timestamp())
+
+    value = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+
+    return None
+
+def to_int(value):
+    """Convert a CSV/JSON engagement value to int"""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+def record_to_row(record, source):
+    """Map a scraper record from any source onto the index columns"""
+    text = str(record.get('text') or '')
+    title = str(record.get('title') or '')
+    author = str(record.get('author') or record.get('username') or record.get('author_id') or '')
+    created = record.get('created') or record.get('created_at') or record.get('timestamp') or ''
+
+    if 'score' in record:
+        engagement = to_int(record.get('score'))
+    else:
+        engagement = to_int(record.get('likes')) + to_int(record.get('retweets'))
+    comments = to_int(record.get('comments', record.get('replies')))
+
+    url = str(record.get('permalink') or record.get('url') or '')
+    if record.get('id'):
+        key = f"{source}:{record['id']}"
+    elif url:
+        key = f"{source}:{url}"
+    else:
+        key = f"{source}:{author}|{created}|{text[:80]}"
+
+    return (key, source, title, text, author, url, str(created),
+            parse_created(created), engagement, comments)
+
+def index_records(records, source, db_path=SEARCH_DB_FILE):
+    """Add or update scraped records in the search index"""
+    if not records:
+        return 0
+
+    rows = [record_to_row(record, source) for record in records]
+
+    try:
+        conn = connect_index(db_path)
+        with conn:
+            conn.executemany(UPSERT_SQL, rows)
+        conn.close()
+        print(f"Indexed {len(rows)} {source} items in {db_path}")
+        return len(rows)
+
+    except Exception as e:
+        print(f"Error updating search index: {e}")
+        return 0
+
+def quote_term(term):
+    """Quote a term or phrase for FTS5"""
+    term = term.strip('"')
+    return '"' + term.replace('"', '""') + '"'
+
+def tokenize_query(twitter_query):
+    """Split a query in TWITTER_QUERY syntax into tokens, dropping Twitter operators"""
+    return [token for token in QUERY_TOKEN_PATTERN.findall(twitter_query)
+            if not TWITTER_OPERATOR_PATTERN.match(token)]
+
+def convert_query_to_fts(twitter_query):
+    """Convert Twitter search syntax (as in TWITTER_QUERY) to an FTS5 query"""
+    positive = []
+    negative = []
+
+    for token in tokenize_query(twitter_query):
+        if token in ('(', ')'):
+            positive.append(token)
+        elif token.upper() in ('AND', 'OR', 'NOT'):
+            positive.append(token.upper())
+        elif token.startswith('-') and len(token) > 1:
+            negative.append(quote_term(token[1:]))
+        else:
+            positive.append(quote_term(token))
+
+    # Removing operators can leave dangling AND/OR or empty parentheses
+    cleaned = []
+    for token in positive:
+        if token in ('AND', 'OR', 'NOT') and (not cleaned or cleaned[-1] in ('(', 'AND', 'OR', 'NOT')):
+            continue
+        if token == ')' and cleaned and cleaned[-1] in ('AND', 'OR', 'NOT'):
+            cleaned.pop()
+        if token == ')' and cleaned and cleaned[-1] == '(':
+            cleaned.pop()
+            continue
+        # FTS5 only allows implicit AND between phrases, so spell it out
+        if (token == '(' or token.startswith('"')) and cleaned and (cleaned[-1] == ')' or cleaned[-1].startswith('"')):
+            cleaned.append('AND')
+        cleaned.append(token)
+    while cleaned and cleaned[-1] in ('AND', 'OR', 'NOT'):
+        cleaned.pop()
+
+    depth = 0
+    for token in cleaned:
+        depth += {'(': 1, ')': -1}.get(token, 0)
+        if depth < 0:
+            break
+    if depth != 0:
+        raise ValueError(f"Unbalanced parentheses in query: {twitter_query!r}")
+
+    # FTS5 cannot match on negations or Twitter operators alone
+    if not any(token.startswith('"') for token in cleaned):
+        raise ValueError(f"Query has no searchable terms: {twitter_query!r}")
+
+    query = ' '.join(cleaned)
+    if negative:
+        query = f"({query}) " + ' '.join(f"NOT {term}" for term in negative)
+
+    return query
+
+def search(query, source=None, since=None, until=None, min_engagement=0,
+           limit=50, db_path=SEARCH_DB_FILE):
+    """Run a ranked full-text query with optional source/date/engagement filters
+
+    `query` uses the same syntax as TWITTER_QUERY. `since` and `until`
+    accept any timestamp format the scrapers produce (e.g. '2025-07-01').
+    Raises ValueError for a query without search terms or an unparseable date.
+    """
+    sql = """
+        SELECT items.source, items.title, items.text, items.author, items.url,
+               items.created, items.engagement, items.comments,
+               bm25(items_fts, 2.0, 1.0) AS rank
+        FROM items_fts JOIN items ON items.id = items_fts.rowid
+        WHERE items_fts MATCH ?
+    """
+    params = [convert_query_to_fts(query)]
+
+    if source:
+        sql += " AND items.source = ?"
+        params.append(source)
+    for value, operator in ((since, '>='), (until, '<')):
+        if not value:
+            continue
+        timestamp = parse_created(value)
+        if timestamp is None:
+            raise ValueError(f"Unrecognized date: {value!r} (expected e.g. 2025-07-01)")
+        sql += f" AND items.created_ts {operator} ?"
+        params.append(timestamp)
+    if min_engagement:
+        sql += " AND items.engagement >= ?"
+        params.append(min_engagement)
+
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(limit)
+
+    conn = connect_index(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [dict(row) for row in conn.execute(sql, params)]
+    except sqlite3.OperationalError as e:
+        # Anything the converter lets through that FTS5 still rejects
+        if 'fts5' not in str(e):
+            raise
+        raise ValueError(f"Invalid query {query!r}: {e}") from e
+    finally:
+        conn.close()
+
+def rebuild_from_csv(data_dir='data', db_path=SEARCH_DB_FILE):
+    """Backfill the index from CSV files already saved under data/"""
+    total = 0
+
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.csv'))):
+        name = os.path.basename(path)
+        source = next((label for prefix, label in CSV_SOURCES.items() if name.startswith(prefix)), None)
+        if not source:
+            print(f"Skipping {name}: unknown source")
+            continue
+
+        with open(path, newline='', encoding='utf-8') as f:
+            records = list(csv.DictReader(f))
+
+        total += index_records(records, source, db_path)
+
+    return total
+
+def add_search_arguments(parser):
+    """Register the search options on an argparse parser"""
+    parser.add_argument('query', nargs='*', help='Query in TWITTER_QUERY syntax')
+    parser.add_argument('--source', help='reddit, hackernews, nitter or twitter')
+    parser.add_argument('--since', help='Earliest date, e.g. 2025-07-01')
+    parser.add_argument('--until', help='Latest date (exclusive)')
+    parser.add_argument('--min-engagement', type=int, default=0)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--rebuild', action='store_true', help='Backfill the index from data/*.csv')
+
+def merge_query_terms(args, extra, parser):
+    """Fold negations such as -is:retweet, which argparse leaves unparsed, into the query"""
+    unknown = [token for token in extra if token.startswith('--') or not token.startswith('-')]
+    if unknown:
+        parser.error(f"unrecognized arguments: {' '.join(unknown)}")
+
+    args.query = ' '.join(args.query + extra)
+    return args
+
+def run_search_command(args):
+    """Run a search from parsed arguments and print the results
+
+    Raises ValueError for an invalid query or date.
+    """
+    if args.rebuild:
+        rebuild_from_csv()
+    if not args.query:
+        return
+
+    start = time.perf_counter()
+    results = search(args.query, args.source, args.since, args.until,
+                     args.min_engagement, args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"{len(results)} results in {elapsed:.1f} ms")
+    for row in results:
+        print(f"\n- [{row['source']}] {row['created']} | Engagement: {row['engagement']}")
+        print(f"  {(row['title'] or row['text'])[:100]}")
+        if row['url']:
+            print(f"  {row['url']}")
+
+def main(argv=None):
+    """Command line entry for querying the search index"""
+    parser = argparse.ArgumentParser(description='Search collected AI research items')
+    add_search_arguments(parser)
+    args, extra = parser.parse_known_args(argv)
+    merge_query_terms(args, extra, parser)
+
+    try:
+        run_search_command(args)
+    except ValueError as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import re
+import numpy as np
+from scipy import sparse
+
+from twitter_query import ALT_QUERIES
+from search_index import tokenize_query
+
+WORD_PATTERN = re.compile(r'\w+')
+
+def parse_category_query(query):
+    """Parse a category query into OR-ed conjunctions of phrases (DNF)
+
+    Follows Twitter precedence: adjacency and AND bind tighter than OR, so
+    '"a" "b" OR "c"' becomes [['a', 'b'], ['c']] and '("a" OR "b") "c"'
+    becomes [['a', 'c'], ['b', 'c']]. Twitter operators (lang:en) and
+    negated terms (-is:retweet) are ignored. Raises ValueError on
+    unbalanced parentheses or unsupported operators.
+    """
+    tokens = tokenize_query(query)
+    position = 0
+
+    def parse_or():
+        nonlocal position
+        conjunctions = parse_and()
+        while position < len(tokens) and tokens[position].upper() == 'OR':
+            position += 1
+            conjunctions = conjunctions + parse_and()
+        return conjunctions
+
+    def parse_and():
+        nonlocal position
+        conjunctions = [frozenset()]
+        while position < len(tokens) and tokens[position] != ')' and tokens[position].upper() != 'OR':
+            token = tokens[position]
+            position += 1
+
+            if token.upper() == 'AND' or token.startswith('-'):
+                continue
+            if token.upper() == 'NOT':
+                raise ValueError(f"NOT is not supported in category queries: {query!r}")
+
+            if token == '(':
+                operand = parse_or()
+                if position >= len(tokens) or tokens[position] != ')':
+                    raise ValueError(f"Unbalanced parentheses in category query: {query!r}")
+                position += 1
+                if not operand:
+                    # A group of only ignored terms doesn't constrain the match
+                    continue
+            else:
+                operand = [frozenset([token.strip('"').lower()])]
+
+            # (A or B) and (C or D) -> AC or AD or BC or BD
+            conjunctions = [left | right for left in conjunctions for right in operand]
+
+        # A branch made only of ignored terms would otherwise match everything
+        return [conjunction for conjunction in conjunctions if conjunction]
+
+    conjunctions = parse_or()
+    if position != len(tokens):
+        raise ValueError(f"Unbalanced parentheses in category query: {query!r}")
+
+    # Deduplicate while keeping a stable order
+    unique = list(dict.fromkeys(conjunctions))
+    return [sorted(conjunction) for conjunction in unique]
+
+class TopicTagger:
+    """Batch classifier that tags records with every ALT_QUERIES category at once"""
+
+    def __init__(self, categories=ALT_QUERIES):
+        self.categories = list(categories)
+        self.phrases = []
+        phrase_index = {}
+        conjunction_rows, conjunction_cols = [], []
+        category_rows, category_cols = [], []
+        conjunction_sizes = []
+
+        for category_id, category in enumerate(self.categories):
+            for conjunction in parse_category_query(categories[category]):
+                # Key phrases by their words so "Google-AI" and "google ai" coincide
+                phrase_ids = set()
+                for phrase in conjunction:
+                    phrase = ' '.join(WORD_PATTERN.findall(phrase))
+                    if not phrase:
+                        continue
+                    if phrase not in phrase_index:
+                        phrase_index[phrase] = len(self.phrases)
+                        self.phrases.append(phrase)
+                    phrase_ids.add(phrase_index[phrase])
+                if not phrase_ids:
+                    continue
+
+                conjunction_id = len(conjunction_sizes)
+                conjunction_rows.extend(phrase_ids)
+                conjunction_cols.extend([conjunction_id] * len(phrase_ids))
+                conjunction_sizes.append(len(phrase_ids))
+                category_rows.append(conjunction_id)
+                category_cols.append(category_id)
+
+        # phrase -> conjunction membership, and conjunction -> category membership
+        self.phrase_conjunctions = sparse.csr_matrix(
+            (np.ones(len(conjunction_rows), dtype=np.int32), (conjunction_rows, conjunction_cols)),
+            shape=(len(self.phrases), len(conjunction_sizes))
+        )
+        self.conjunction_categories = sparse.csr_matrix(
+            (np.ones(len(category_rows), dtype=np.int32), (category_rows, category_cols)),
+            shape=(len(conjunction_sizes), len(self.categories))
+        )
+        self.conjunction_sizes = np.array(conjunction_sizes, dtype=np.int32)
+
+        # Phrases as word n-grams, looked up directly from each document's tokens
+        self.vocabulary = {
+            tuple(phrase.split()): phrase_id
+            for phrase_id, phrase in enumerate(self.phrases)
+        }
+        self.max_ngram = max((len(ngram) for ngram in self.vocabulary), default=0)
+
+    def term_matrix(self, texts):
+        """Build the sparse document x phrase matrix for a batch of texts
+
+        Each document is tokenized once and its n-grams (up to the longest
+        phrase) are looked up in the phrase vocabulary.
+        """
+        rows, cols = [], []
+        vocabulary = self.vocabulary
+
+        for doc_id, text in enumerate(texts):
+            words = WORD_PATTERN.findall((text or '').lower())
+            found = set()
+
+            for n in range(1, self.max_ngram + 1):
+                for start in range(len(words) - n + 1):
+                    phrase_id = vocabulary.get(tuple(words[start:start + n]))
+                    if phrase_id is not None:
+                        found.add(phrase_id)
+
+            rows.extend([doc_id] * len(found))
+            cols.extend(found)
+
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(texts), len(self.phrases))
+        )
+
+    def tag(self, texts):
+        """Return a boolean (documents x categories) array of topic tags"""
+        terms = self.term_matrix(texts)
+
+        # A conjunction holds when all of its phrases are present
+        present = (terms @ self.phrase_conjunctions).toarray() == self.conjunction_sizes
+
+        # A category holds when any of its conjunctions holds
+        satisfied = sparse.csr_matrix(present.astype(np.int32)) @ self.conjunction_categories
+        return satisfied.toarray() > 0
+
+    def tag_records(self, records, text_fields=('title', 'text'), prefix='topic_'):
+        """Add one boolean field per category, plus a combined 'topics' field"""
+        if not records:
+            return records
+
+        texts = [' '.join(str(record.get(field) or '') for field in text_fields) for record in records]
+        tags = self.tag(texts)
+
+        for record, row in zip(records, tags):
+            for category, hit in zip(self.categories, row):
+                record[f"{prefix}{category}"] = bool(hit)
+            record['topics'] = ','.join(category for category, hit in zip(self.categories, row) if hit)
+
+        return records
+
+def tag_topics(records, categories=ALT_QUERIES):
+    """Tag a list of scraped records with ALT_QUERIES categories"""
+    return TopicTagger(categories).tag_records(records)
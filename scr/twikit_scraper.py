@@ -1,15 +1,17 @@
 import os
-import pandas as pd
 import asyncio
-from twikit import Client
 from datetime import datetime
 import time
 
 # Import your existing config
 from twitter_query import MIN_RETWEETS, MIN_LIKES
+from search_index import index_records
+from csv_sink import sort_records, drop_duplicate_records, write_records_csv
 
 class TwitterScraperTwikit:
     def __init__(self):
+        from twikit import Client
+        
         self.client = Client('en-US')
         self.logged_in = False
     
@@ -149,26 +151,40 @@ async def main():
         print("No tweets found or login failed")
         return
     
-    # Create DataFrame and remove duplicates
-    df = pd.DataFrame(all_tweets)
-    df = df.drop_duplicates(subset=['id'], keep='first')
-    df = df.sort_values(['retweets', 'likes'], ascending=False)
+    # Remove duplicates and sort by engagement
+    tweets = drop_duplicate_records(all_tweets, 'id')
+    tweets = sort_records(tweets, ['retweets', 'likes'])
+    
+    print(f"\nTotal unique high-engagement tweets: {len(tweets)}")
+    
+    # Expand t.co links once and store their canonical targets
+    from link_resolver import extract_links, resolve_links
+    
+    tweet_links = [extract_links(tweet['text']) for tweet in tweets]
+    resolved = resolve_links([link for links in tweet_links for link in links])
+    for tweet, links in zip(tweets, tweet_links):
+        tweet['links'] = ' '.join(resolved[link] for link in links)
     
-    print(f"\nTotal unique high-engagement tweets: {len(df)}")
+    # Topic tagging needs scipy; without it, still save the tweets untagged
+    try:
+        from topic_tagger import tag_topics
+        tag_topics(tweets)
+    except Exception as e:
+        print(f"Skipping topic tagging ({e}); saving untagged results")
     
     # Save results
-    os.makedirs('data', exist_ok=True)
     output_file = 'data/twikit_ai_research_tweets.csv'
-    df.to_csv(output_file, index=False)
+    write_records_csv(tweets, output_file)
+    index_records(tweets, 'twitter')
     
     print(f"Saved to {output_file}")
     
     # Display top results
     print(f"\nTop tweets by engagement:")
-    for idx, row in df.head(10).iterrows():
-        print(f"\n- @{row['author']} | RT:{row['retweets']} L:{row['likes']}")
-        print(f"  {row['text'][:100]}...")
-        print(f"  {row['url']}")
+    for tweet in tweets[:10]:
+        print(f"\n- @{tweet['author']} | RT:{tweet['retweets']} L:{tweet['likes']}")
+        print(f"  {tweet['text'][:100]}...")
+        print(f"  {tweet['url']}")
 
 def setup_credentials():
     """Helper to set up Twitter credentials"""